@@ -1,8 +1,11 @@
 """Search for scenes in the Landsat catalog."""
 
 from datetime import datetime
+from functools import lru_cache
 
-from shapely import wkt
+import shapely
+from shapely import wkb, wkt
+from shapely.prepared import prep
 
 from pylandsat import queries
 from pylandsat.database import LandsatDB
@@ -12,17 +15,52 @@ SENSORS = ['LC08', 'LE07', 'LT05', 'LT04', 'LM05',
            'LM04', 'LM03', 'LM02', 'LM01']
 TIERS = ['T1', 'T2', 'RT']
 
+# Vectorized geometry operations are available since Shapely 2.0
+_has_vectorized = hasattr(shapely, 'intersection')
+
+# Timestamp of the Landsat 7 Scan Line Corrector (SLC) failure
+SLC_FAILURE = int(datetime(2003, 5, 31).timestamp())
+
 
 def _to_list(value):
-    """Convert string parameter value to a list with a single element."""
+    """Convert string parameter value to a list with a single element.
+    Lists and tuples are returned as is.
+    """
     if not value:
         return None
-    elif isinstance(value, list):
+    if isinstance(value, (list, tuple)):
         return value
-    elif isinstance(value, tuple):
-        return list(value)
-    else:
-        return [value]
+    return [value]
+
+
+@lru_cache(maxsize=256)
+def _wkt_from_wkb(geom_wkb):
+    """Get the WKT representation of a WKB geometry."""
+    return wkt.dumps(wkb.loads(geom_wkb), rounding_precision=8)
+
+
+def _to_wkt(geom):
+    """Convert a shapely geometry to WKT. Results are cached on the WKB
+    representation as shapely geometries are not always hashable.
+    """
+    return _wkt_from_wkb(geom.wkb)
+
+
+@lru_cache(maxsize=1024)
+def _load_footprint(geom_wkb):
+    """Parse a WRS2 footprint returned by the database as WKB."""
+    return wkb.loads(geom_wkb)
+
+
+def _coverage(geom, footprints):
+    """Compute the fraction of a geometry covered by each footprint."""
+    if _has_vectorized:
+        areas = shapely.area(shapely.intersection(geom, footprints))
+        return (areas / geom.area).tolist()
+    prepared = prep(geom)
+    return [1. if prepared.within(footprint)
+            else geom.intersection(footprint).area / geom.area
+            for footprint in footprints]
 
 
 class Catalog:
@@ -78,7 +116,7 @@ class Catalog:
 
         # Convert geometry to WKT
         if geom:
-            geom = wkt.dumps(geom, rounding_precision=8)
+            geom = _to_wkt(geom)
 
         # Default values
         if not maxcloud and not isinstance(maxcloud, float):
@@ -88,51 +126,46 @@ class Catalog:
         if not tiers:
             tiers = TIERS
 
+        # Exclude LE07 scenes acquired after the SLC failure if requested
+        slc_limit = SLC_FAILURE if slc else float('inf')
+
         # Spatial filter with WRS paths and rows
         if path and row:
             scenes = self.db.query(
                 query=queries.CATALOG_SEARCH_PATHROW,
-                params=(path, row, begin, end, maxcloud, sensors, tiers))
+                params=(path, row, begin, end, maxcloud, sensors, tiers,
+                        slc_limit))
         elif geom:
             scenes = self.db.query(
                 query=queries.CATALOG_SEARCH_GEOM,
-                params=(geom, begin, end, maxcloud, sensors, tiers, geom))
+                params=(geom, geom, begin, end, maxcloud, sensors, tiers,
+                        slc_limit))
         else:
             raise ValueError('No spatial information provided.')
         
+        results = []
         for scene in scenes:
             scene.update(
                 sensing_time=datetime.fromtimestamp(scene['sensing_time']))
+            results.append(scene)
 
-        def _slc_on(scene):
-            FAILURE = datetime(2003, 5, 31)
-            sat = scene['product_id'][3]
-            if sat != '7':
-                return True
-            elif scene['sensing_time'] >= FAILURE:
-                return False
-            else:
-                return True
-        
-        if slc:
-            scenes_ = scenes.copy()
-            scenes = [scene for scene in scenes_ if _slc_on(scene)]
-
-        return scenes
+        return results
 
     def wrs(self, geom):
         """Find WRS2 paths and rows that intersect a given geometry.
-        Also returns the geometry of each footprint and their coverage
-        of the geometry of interest if it is not a polygon.
+        Also returns the geometry of each footprint (as WKT) and their
+        coverage of the geometry of interest if it is a polygon.
         """
-        geom_wkt = wkt.dumps(geom, rounding_precision=8)
-        path_row = self.db.query(
-            queries.WRS_SEARCH, params=(geom_wkt, geom_wkt))
-
-        if 'POLYGON' in geom_wkt:
-            for pr in path_row:
-                footprint = wkt.loads(pr['geom'])
-                cover = geom.intersection(footprint).area / geom.area
+        geom_wkt = _to_wkt(geom)
+        path_row = list(self.db.query(
+            queries.WRS_SEARCH, params=(geom_wkt, geom_wkt)))
+        # WKB footprints are only used internally to compute coverage
+        footprints = [pr.pop('geom_wkb') for pr in path_row]
+
+        if 'POLYGON' in geom_wkt and path_row:
+            covers = _coverage(
+                geom, [_load_footprint(fp) for fp in footprints])
+            for pr, cover in zip(path_row, covers):
                 pr.update(cover=cover)
 
         return path_row
@@ -141,6 +174,6 @@ class Catalog:
         """Get available metadata for a given scene identified
         by its Product Identifier.
         """
-        response = self.db.query(
-            queries.CATALOG_SEARCH_PRODUCT, params=(product_id, ))
+        response = list(self.db.query(
+            queries.CATALOG_SEARCH_PRODUCT, params=(product_id, )))
         return response[0]
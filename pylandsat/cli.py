@@ -1,9 +1,10 @@
 """Command-line interface."""
 
+from concurrent.futures import ThreadPoolExecutor
 import csv
+from functools import lru_cache
 import json
 import os
-from pkg_resources import resource_string
 
 from appdirs import user_data_dir
 import click
@@ -16,9 +17,22 @@ except ImportError:
     _has_geopy = False
     pass
 
+try:
+    import orjson
+    _has_orjson = True
+except ImportError:
+    _has_orjson = False
+
 from pylandsat.catalog import Catalog
 from pylandsat.database import sync_catalog, sync_wrs
-from pylandsat.download import Product
+from pylandsat.download import FILES, MAX_WORKERS, Product
+from pylandsat.utils import create_session
+
+
+@lru_cache(maxsize=1)
+def _get_catalog():
+    """Get a shared Catalog instance (and its database connection)."""
+    return Catalog()
 
 
 @click.group()
@@ -35,20 +49,16 @@ def print_datadir():
 @click.command(name='list-sensors')
 def list_sensors():
     """Print supported sensors."""
-    res = resource_string(__name__, 'files.json')
-    files = json.loads(res)
-    click.echo(', '.join(files.keys()))
+    click.echo(', '.join(FILES.keys()))
 
 
 @click.command(name='list-available-files')
 @click.argument('sensor', type=click.STRING)
 def list_available_files(sensor):
     """Print available sensors."""
-    res = resource_string(__name__, 'files.json')
-    files = json.loads(res)
-    if sensor not in files:
+    if sensor not in FILES:
         click.exceptions.BadArgumentUsage('Sensor not supported.')
-    click.echo(', '.join(files[sensor]))
+    click.echo(', '.join(FILES[sensor]))
 
 
 @click.command(name='sync-database')
@@ -73,8 +83,12 @@ def _geom_from_geojson(fpath):
     """Get shapely geometry from a GeoJSON file. If multiple features
     are available, only the first one is used.
     """
-    with open(fpath) as f:
-        geojson = json.load(f)
+    if _has_orjson:
+        with open(fpath, 'rb') as f:
+            geojson = orjson.loads(f.read())
+    else:
+        with open(fpath) as f:
+            geojson = json.load(f)
     if geojson['type'] == 'Feature':
         geom = shape(geojson['geometry'])
     elif geojson['type'] == 'FeatureCollection':
@@ -94,6 +108,14 @@ def _geom_from_address(address):
     loc = geoloc.geocode(address)
     return Point(loc.longitude, loc.latitude)
 
+
+def _split_csv_arg(value):
+    """Split a comma-separated option value into a tuple of stripped
+    strings, ignoring empty items.
+    """
+    return tuple(v.strip() for v in value.split(',') if v.strip())
+
+
 def _to_csv(records, output_file):
     """Write a list of dicts to a CSV file."""
     if not records:
@@ -154,11 +176,11 @@ def search(begin, end, geojson, latlon, address, path, row, clouds, sensors,
         end += '-01-01'
 
     if sensors:
-        sensors = [s.strip() for s in sensors.split(',')]
+        sensors = _split_csv_arg(sensors)
     if tiers:
-        tiers = [t.trip() for t in tiers.split(',')]
+        tiers = _split_csv_arg(tiers)
 
-    catalog = Catalog()
+    catalog = _get_catalog()
     scenes = catalog.search(begin, end, path, row, geom, clouds, sensors,
                             tiers, slc=not slcoff)
 
@@ -178,12 +200,23 @@ def search(begin, end, geojson, latlon, address, path, row, clouds, sensors,
 def download(products, output_dir, files):
     """Download a Landsat product according to its identifier."""
     if files:
-        files = [f.strip() for f in files.split(',')]
-    for i, pid in enumerate(products):
+        files = _split_csv_arg(files)
+
+    # Products are downloaded concurrently as the task is IO-bound
+    max_workers = max(1, min(8, len(products)))
+    session = create_session(pool_size=max_workers * MAX_WORKERS)
+
+    def _download(i, pid):
         click.echo('Downloading {} ({}/{}).'.format(pid, i+1, len(products)))
-        product = Product(pid)
+        product = Product(pid, session=session)
         product.download(output_dir, progressbar=True, files=files)
 
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_download, i, pid)
+                   for i, pid in enumerate(products)]
+        for future in futures:
+            future.result()
+
 
 cli.add_command(search)
 cli.add_command(download)
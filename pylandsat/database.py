@@ -5,7 +5,10 @@ and export them to a Spatialite-enabled SQLite database.
 from collections import OrderedDict
 import csv
 from datetime import datetime
-from dateutil.parser import isoparse
+from functools import lru_cache
+import gzip
+from itertools import chain
+from operator import itemgetter
 import os
 import shutil
 import sqlite3
@@ -13,86 +16,167 @@ import tempfile
 
 import fiona
 from appdirs import user_data_dir
-from shapely import wkt
 from shapely.geometry import shape
 from tqdm import tqdm
 
+try:
+    from pyogrio.raw import read as read_ogr
+    _has_pyogrio = True
+except ImportError:
+    _has_pyogrio = False
+
 from pylandsat import queries
 from pylandsat import utils
 
 
 def _flatten(params):
-    """Flatten the list objects in a list of DB-API parameters,
+    """Flatten the list (or tuple) objects in a list of DB-API parameters,
     e.g. `[1, [2, 3]]` becomes `[1, 2, 3]`.
     """
-    params_flat = []
-    for param in params:
-        if isinstance(param, list):
-            for item in param:
-                params_flat.append(item)
-        else:
-            params_flat.append(param)
-    return params_flat
+    return list(chain.from_iterable(
+        param if isinstance(param, (list, tuple)) else (param, )
+        for param in params))
+
+
+@lru_cache(maxsize=128)
+def _expand_placeholders(query, lengths):
+    """Replace a single '?' DB-API placeholder after each 'IN'
+    statement by an array of placeholders whose length is given
+    by `lengths`. Results are cached for each query shape.
+    """
+    for n in lengths:
+        placeholders = ('?,' * n)[:-1]
+        query = query.replace('IN ?', 'IN ({})'.format(placeholders), 1)
+    return query
 
 
 def _format_placeholders(query, params):
     """Replace a single '?' DB-API placeholder after each 'IN'
     statement by an array of placeholders, e.g. `IN ?` becomes
     `IN (?, ?, ?)`. Also flatten the given parameter list.
-    (This is because lists are not supported as DB-API parameters.)
+    (This is because lists and tuples are not supported as DB-API
+    parameters.)
     """
-    n_placeholders = [len(p) for p in params if isinstance(p, list)]
-    for n in n_placeholders:
-        placeholders = ','.join(list('?' * n))
-        query = query.replace('IN ?', 'IN ({})'.format(placeholders), 1)
-    return query, _flatten(params)
+    lengths = tuple(len(p) for p in params if isinstance(p, (list, tuple)))
+    return _expand_placeholders(query, lengths), _flatten(params)
 
 
 class LandsatDB:
-    """Initialize and query a Spatialite-enabled SQLite database."""
+    """Initialize and query a Spatialite-enabled SQLite database.
+
+    A single connection is lazily opened on first use and reused by
+    subsequent queries until `close()` is called. As with any sqlite3
+    connection, it can only be used from the thread that opened it.
+    """
 
     def __init__(self):
         os.makedirs(user_data_dir('pylandsat'), exist_ok=True)
         self.path = os.path.join(user_data_dir('pylandsat'), 'landsat.db')
+        self._conn = None
 
     def connect(self):
-        """Connect to the DB and enable Spatialite."""
-        conn = sqlite3.connect(self.path)
-        conn.enable_load_extension(True)
-        conn.execute("SELECT load_extension('mod_spatialite');")
-        return conn
-
-    def query(self, query, params=None):
-        """Perform an SQL query and returns the result as a dict."""
-        conn = self.connect()
-        conn.row_factory = sqlite3.Row
-        c = conn.cursor()
+        """Connect to the DB and enable Spatialite. Returns the shared
+        connection if it is already open.
+        """
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, cached_statements=256)
+            conn.enable_load_extension(True)
+            conn.execute("SELECT load_extension('mod_spatialite');")
+            conn.row_factory = sqlite3.Row
+            self._conn = conn
+        return self._conn
+
+    def close(self):
+        """Close the shared connection, if any."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _execute(self, query, params=None):
+        """Execute an SQL query and return the cursor."""
+        c = self.connect().cursor()
         if params:
             query, params = _format_placeholders(query, params)
             c.execute(query, params)
         else:
             c.execute(query)
-        rows = c.fetchall()
-        conn.close()
-        return [dict(row) for row in rows]
+        return c
+
+    def query(self, query, params=None):
+        """Perform an SQL query and lazily iterate over the resulting
+        rows as dicts.
+        """
+        return (dict(row) for row in self._execute(query, params))
+
+    def query_rows(self, query, params=None):
+        """Perform an SQL query and return the resulting rows as a list
+        of tuples.
+        """
+        return [tuple(row) for row in self._execute(query, params)]
 
 
 def _parse_datestring(datestring):
-    """Parse ISO-8601 date string from the index.csv file."""
-    date = isoparse(datestring[:26])
+    """Parse ISO-8601 date string from the index.csv file. Fractions of
+    seconds are ignored as timestamps are stored as integers.
+    """
+    date = datetime(
+        int(datestring[0:4]), int(datestring[5:7]), int(datestring[8:10]),
+        int(datestring[11:13]), int(datestring[14:16]), int(datestring[17:19]))
     return int(date.timestamp())
 
 
+# Get product ID, scene ID, path, row, sensing time and cloud cover
+# from a row of the index.csv file
+_get_columns = itemgetter(1, 0, 9, 10, 7, 11)
+
+
 def _parse_row(row):
     """Parse a row from the index.csv file."""
-    INDEXES = [1, 0, 9, 10, 7, 11]
-    product_id, scene_id, path, row, sensing_time, cloud_cover = (row[i] for i in INDEXES)
+    product_id, scene_id, path, row, sensing_time, cloud_cover = _get_columns(row)
     path, row = int(path), int(row)
     cloud_cover = float(cloud_cover)
     sensing_time = _parse_datestring(sensing_time)
     return (product_id, scene_id, path, row, sensing_time, cloud_cover)
 
 
+def _track_progress(lines, fileobj, progress, every=10000):
+    """Iterate over the lines of a file while updating a progress bar
+    according to the number of bytes read from the underlying file
+    object (checked every `every` lines).
+    """
+    for i, line in enumerate(lines, start=1):
+        if not i % every:
+            progress.update(fileobj.tell() - progress.n)
+        yield line
+    progress.update(fileobj.tell() - progress.n)
+
+
+def _load_catalog(conn, rows):
+    """Replace the content of the catalog table by the given rows of the
+    index.csv file (header excluded). Everything happens in a single
+    transaction, so that the previous catalog is kept if loading fails.
+    """
+    c = conn.cursor()
+    with conn:
+        # DDL statements do not implicitly open a transaction
+        c.execute('BEGIN')
+        c.execute(queries.CATALOG_DROP)
+        c.execute(queries.CATALOG_CREATE)
+
+        # Rows without product ID (pre-collection scenes) are skipped
+        values = map(_parse_row, filter(itemgetter(1), rows))
+        c.executemany(queries.CATALOG_UPDATE, values)
+
+        # Build indexes after insertion, removing duplicates if needed
+        try:
+            c.execute(queries.CATALOG_UNIQUE)
+        except sqlite3.IntegrityError:
+            c.execute(queries.CATALOG_DEDUPLICATE)
+            c.execute(queries.CATALOG_UNIQUE)
+        c.execute(queries.CATALOG_INDEX)
+        c.execute(queries.CATALOG_INDEX_SENSOR)
+
+
 def sync_catalog():
     """Download Landsat catalog from Google and update the SQLite database
     accordingly.
@@ -100,28 +184,41 @@ def sync_catalog():
     CATALOG_URL = 'https://storage.googleapis.com/gcp-public-data-landsat/index.csv.gz'
     with tempfile.TemporaryDirectory(prefix="pylandsat_") as tmpdir:
         fpath = utils.download_file(CATALOG_URL, tmpdir, progressbar=True)
-        fpath = utils.decompress(fpath, remove_archive=True)
 
-        # Create database and 'catalog' table
         db = LandsatDB()
         conn = db.connect()
-        c = conn.cursor()
-        c.execute(queries.CATALOG_CREATE)
-        conn.commit()
-
-        # Insert CSV rows into the SQLite database
-        length = sum(1 for line in open(fpath))
-        progress = tqdm(total=length, unit=' rows')
-        with open(fpath) as src:
-            reader = csv.reader(src)
-            _ = reader.__next__()  # ignore header
-            for row in reader:
-                if row[1]:
-                    c.execute(queries.CATALOG_UPDATE, _parse_row(row))
-                progress.update(1)
-        progress.close()
-        conn.commit()
-        conn.close()
+
+        # Replace the catalog with the CSV rows in a single transaction
+        # (the archive is decompressed on the fly)
+        progress = tqdm(total=os.path.getsize(fpath), unit='B', unit_scale=True)
+        try:
+            conn.executescript(queries.BULK_INSERT_PRAGMAS)
+            with open(fpath, 'rb') as archive, \
+                    gzip.open(archive, 'rt', newline='') as src:
+                reader = csv.reader(_track_progress(src, archive, progress))
+                _ = reader.__next__()  # ignore header
+                _load_catalog(conn, reader)
+            conn.executescript(queries.BULK_INSERT_RESTORE)
+        finally:
+            progress.close()
+            db.close()
+
+
+def _read_wrs(fpath):
+    """Read (path, row, WKB geometry) records from the zipped WRS2
+    shapefile. Pyogrio is used if available to get all the WKB
+    geometries at once from OGR.
+    """
+    if _has_pyogrio:
+        meta, _, geoms, field_data = read_ogr(
+            '/vsizip/' + fpath + '/WRS2_descending.shp',
+            columns=['PATH', 'ROW'])
+        # Fields are returned in their order in the layer
+        fields = dict(zip(meta['fields'], field_data))
+        return zip(fields['PATH'].tolist(), fields['ROW'].tolist(), geoms)
+    collection = fiona.open('/WRS2_descending.shp', vfs='zip://' + fpath)
+    return ((f['properties']['PATH'], f['properties']['ROW'],
+             shape(f['geometry']).wkb) for f in collection)
 
 
 def sync_wrs():
@@ -136,20 +233,17 @@ def sync_wrs():
         # Connect to the database, init spatial metadata and create the table
         db = LandsatDB()
         conn = db.connect()
-        c = conn.cursor()
-        c.executescript(queries.WRS_CREATE)
-        conn.commit()
-
-        def _to_wkt(feature):
-            geom = shape(feature['geometry'])
-            return wkt.dumps(geom, rounding_precision=8)
-
-        # Insert values and create the spatial index
-        collection = fiona.open('/WRS2_descending.shp', vfs='zip://' + fpath)
-        values = ((f['properties']['PATH'], f['properties']['ROW'], _to_wkt(f))
-                for f in collection)
-        c.executemany(queries.WRS_UPDATE, values)
-        c.execute(queries.WRS_INDEX)
-
-        conn.commit()
-        conn.close()
+        try:
+            c = conn.cursor()
+            c.executescript(queries.BULK_INSERT_PRAGMAS)
+            c.executescript(queries.WRS_CREATE)
+            conn.commit()
+
+            # Insert values and create the spatial index in a single
+            # transaction
+            with conn:
+                c.executemany(queries.WRS_UPDATE, _read_wrs(fpath))
+                c.execute(queries.WRS_INDEX)
+            c.executescript(queries.BULK_INSERT_RESTORE)
+        finally:
+            db.close()
@@ -1,10 +1,14 @@
 """Downloading Landsat products from Google public dataset."""
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import json
 import os
 from pkg_resources import resource_string
+import threading
 
-from pylandsat.utils import download_file, meta_from_pid
+from tqdm import tqdm
+
+from pylandsat.utils import SESSION, download_file, meta_from_pid
 
 BASE_URL = (
     "https://storage.googleapis.com/gcp-public-data-landsat/"
@@ -12,29 +16,36 @@ BASE_URL = (
 )
 
 
+# Available files for each sensor
+FILES = json.loads(resource_string(__name__, "files.json"))
+
+# Max. number of files downloaded concurrently for a given product
+MAX_WORKERS = 8
+
+
 class Product:
     """Landsat product to download."""
 
-    def __init__(self, product_id):
+    def __init__(self, product_id, session=None):
         """Initialize a product download.
 
         Attributes
         ----------
         product_id : str
             Landsat product identifier.
-        out_dir : str
-            Path to output directory.
+        session : requests.Session, optional
+            HTTP session shared between downloads. A module-level
+            session is used by default.
         """
         self.product_id = product_id
+        self.session = session or SESSION
         self.meta = meta_from_pid(product_id)
         self.baseurl = BASE_URL.format(**self.meta)
 
     @property
     def available(self):
         """List all available files."""
-        resource = resource_string(__name__, "files.json")
-        labels = json.loads(resource)
-        return labels[self.meta["sensor"]]
+        return FILES[self.meta["sensor"]]
 
     def _url(self, label):
         """Get download URL of a given file according to its label."""
@@ -53,7 +64,7 @@ class Product:
             Path to output directory. A subdirectory named after the
             product ID will automatically be created.
         progressbar : bool, optional
-            Show a progress bar.
+            Show a progress bar (downloaded bytes and files).
         files : list of str, optional
             Specify the files to download manually. By default, all available
             files will be downloaded.
@@ -67,8 +78,33 @@ class Product:
         else:
             files = [f for f in files if f in self.available]
 
-        for label in files:
-            if ".tif" in label:
-                label = label.replace(".tif", ".TIF")
-            url = self._url(label)
-            download_file(url, dst_dir, progressbar=progressbar, verify=verify)
+        urls = [self._url(label.replace(".tif", ".TIF")) for label in files]
+
+        # A single progress bar is shared by all the download threads
+        callback = None
+        if progressbar:
+            progress = tqdm(unit='B', unit_scale=True, desc=self.product_id)
+            lock = threading.Lock()
+
+            def callback(nbytes):
+                with lock:
+                    progress.update(nbytes)
+
+        def _download(url):
+            return download_file(url, dst_dir, progressbar=False,
+                                 verify=verify, session=self.session,
+                                 callback=callback)
+
+        # Files are downloaded concurrently as the task is IO-bound
+        max_workers = max(1, min(MAX_WORKERS, len(urls)))
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [executor.submit(_download, url) for url in urls]
+                for n, future in enumerate(as_completed(futures), start=1):
+                    future.result()
+                    if progressbar:
+                        progress.set_postfix_str(
+                            '{}/{} files'.format(n, len(urls)))
+        finally:
+            if progressbar:
+                progress.close()
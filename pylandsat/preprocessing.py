@@ -20,9 +20,11 @@ def to_radiance(dn, gain, bias):
     Returns
     -------
     radiance : 2d array
-        Output image, TOA spectral radiance.
+        Output image, TOA spectral radiance (float32).
     """
-    return gain * dn + bias
+    radiance = np.multiply(dn, gain, dtype=np.float32)
+    radiance += np.float32(bias)
+    return radiance
 
 
 def to_reflectance(dn, gain, bias, sun_elevation_angle=None):
@@ -43,11 +45,14 @@ def to_reflectance(dn, gain, bias, sun_elevation_angle=None):
     Returns
     -------
     reflectance : 2d array
-        Output image, TOA planetary reflectance.
+        Output image, TOA planetary reflectance (float32).
     """
-    reflectance = gain * dn + bias
+    # Sun angle correction is folded into the rescaling factors
     if sun_elevation_angle:
-        reflectance /= np.sin(np.radians(sun_elevation_angle))
+        sin = np.sin(np.radians(sun_elevation_angle))
+        gain, bias = gain / sin, bias / sin
+    reflectance = np.multiply(dn, gain, dtype=np.float32)
+    reflectance += np.float32(bias)
     return reflectance
 
 
@@ -1,9 +1,30 @@
 """Pre-made SQL queries."""
 
-# Create catalog table
+# Speed up bulk inserts (WAL journal, no fsync, in-memory temp storage,
+# 256MB page cache)
+BULK_INSERT_PRAGMAS = """
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=OFF;
+PRAGMA temp_store=MEMORY;
+PRAGMA cache_size=-262144;
+"""
+
+# Switch back to the default rollback journal once the bulk insert is done,
+# as the journal mode is stored in the database file (other settings only
+# apply to the current connection)
+BULK_INSERT_RESTORE = """
+PRAGMA journal_mode=DELETE;
+"""
+
+# Drop the previous catalog table
+CATALOG_DROP = """
+DROP TABLE IF EXISTS catalog;"""
+
+# Create catalog table. No primary key is declared so that rows are
+# bulk-inserted without maintaining an index, see CATALOG_UNIQUE.
 CATALOG_CREATE = """
-CREATE TABLE IF NOT EXISTS catalog (
-    product_id TEXT PRIMARY KEY NOT NULL,
+CREATE TABLE catalog (
+    product_id TEXT NOT NULL,
     scene_id TEXT,
     path INTEGER,
     row INTEGER,
@@ -13,12 +34,27 @@ CREATE TABLE IF NOT EXISTS catalog (
 
 # Insert values into catalog table
 CATALOG_UPDATE = """
-INSERT OR IGNORE INTO catalog (product_id, scene_id, path, row,
+INSERT INTO catalog (product_id, scene_id, path, row,
   sensing_time, cloud_cover)
   VALUES (?, ?, ?, ?, ?, ?);"""
 
+# Create unique index on product ID once all rows have been inserted
+CATALOG_UNIQUE = """
+CREATE UNIQUE INDEX IF NOT EXISTS idx_catalog_pid ON catalog (product_id);"""
+
+# Remove duplicated product IDs, keeping the first inserted row
+CATALOG_DEDUPLICATE = """
+DELETE FROM catalog WHERE ROWID NOT IN (
+  SELECT MIN(ROWID) FROM catalog GROUP BY product_id);"""
+
 # Create index on path/row
-CATALOG_INDEX = "CREATE INDEX idx_catalog_pathrow ON catalog (path, row);"
+CATALOG_INDEX = """
+CREATE INDEX IF NOT EXISTS idx_catalog_pathrow ON catalog (path, row);"""
+
+# Create composite index on sensor, sensing time and cloud cover
+CATALOG_INDEX_SENSOR = """
+CREATE INDEX IF NOT EXISTS idx_catalog_sensor ON catalog (
+  SUBSTR(product_id, 1, 4), sensing_time, cloud_cover);"""
 
 # Create the WRS table
 WRS_CREATE = """
@@ -34,7 +70,7 @@ SELECT AddGeometryColumn('wrs', 'geom', 4326, 'GEOMETRY', 'XY');
 # Insert values into the wrs table
 WRS_UPDATE = """
 INSERT OR IGNORE INTO wrs (path, row, geom)
-  VALUES (?, ?, GeomFromText(?, 4326));
+  VALUES (?, ?, GeomFromWKB(?, 4326));
 """
 
 # Create a spatial index on the wrs table
@@ -42,16 +78,18 @@ WRS_INDEX = "SELECT CreateSpatialIndex('wrs', 'geom');"
 
 # Find path/row that intersect an input geometry
 WRS_SEARCH = """
-SELECT path, row, AsText(geom) AS geom FROM wrs
-WHERE Intersects(geom, GeomFromText(?, 4326))
-  AND wrs.ROWID IN (
+SELECT path, row, AsText(geom) AS geom, AsBinary(geom) AS geom_wkb FROM wrs
+WHERE wrs.ROWID IN (
     SELECT ROWID FROM SpatialIndex
     WHERE f_table_name = 'wrs'
     AND search_frame = GeomFromText(?, 4326)
-  );
+  )
+  AND Intersects(geom, GeomFromText(?, 4326));
 """
 
 # Search the catalog using path and row as spatial filtering
+# Tuple to provide: (list of paths, list of rows, begin date, end date,
+# max cloud cover, list of sensor ids, list of tiers, LE07 max. date)
 CATALOG_SEARCH_PATHROW = """
 SELECT catalog.product_id, catalog.scene_id, catalog.path, catalog.row,
   catalog.sensing_time, catalog.cloud_cover, AsText(wrs.geom) AS geom
@@ -62,26 +100,30 @@ WHERE catalog.path IN ? AND catalog.row IN ?
   AND catalog.cloud_cover <= ?
   AND SUBSTR(catalog.product_id, 1, 4) IN ?
   AND SUBSTR(catalog.product_id, -2, 2) IN ?
+  AND (SUBSTR(catalog.product_id, 4, 1) != '7' OR catalog.sensing_time < ?)
 """
 
-# Search the catalog using an user-provided geometry as spatial filtering
-# Tuple to provide: (geom, begin date, end date, max cloud cover, list of
-# sensor ids, list of tiers, geom)
+# Search the catalog using an user-provided geometry as spatial filtering.
+# Candidate footprints are first pruned with the spatial index, then
+# matching scenes are looked up with the path/row index of the catalog.
+# Tuple to provide: (geom, geom, begin date, end date, max cloud cover,
+# list of sensor ids, list of tiers, LE07 max. date)
 CATALOG_SEARCH_GEOM = """
 SELECT catalog.product_id, catalog.scene_id, catalog.path, catalog.row,
   catalog.sensing_time, catalog.cloud_cover, AsText(wrs.geom) AS geom
-FROM catalog
-INNER JOIN wrs ON wrs.path = catalog.path AND wrs.row = catalog.row
-WHERE Intersects(wrs.geom, GeomFromText(?, 4326))
+FROM wrs
+CROSS JOIN catalog ON catalog.path = wrs.path AND catalog.row = wrs.row
+WHERE wrs.ROWID IN (
+    SELECT ROWID FROM SpatialIndex
+    WHERE f_table_name = 'wrs'
+    AND search_frame = GeomFromText(?, 4326)
+  )
+  AND Intersects(wrs.geom, GeomFromText(?, 4326))
   AND catalog.sensing_time BETWEEN ? AND ?
   AND catalog.cloud_cover <= ?
   AND SUBSTR(catalog.product_id, 1, 4) IN ?
   AND SUBSTR(catalog.product_id, -2, 2) IN ?
-  AND wrs.ROWID IN (
-    SELECT ROWID FROM SpatialIndex
-    WHERE f_table_name = 'wrs'
-    AND search_frame = GeomFromText(?, 4326)
-  );
+  AND (SUBSTR(catalog.product_id, 4, 1) != '7' OR catalog.sensing_time < ?);
 """
 
 # Get metadata for a given product ID
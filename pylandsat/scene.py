@@ -9,41 +9,52 @@ Glossary of variables referring to a band with examples :
   * band short name : 'nir'
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from itertools import chain
 from datetime import datetime
 import json
 import os
+import re
 from pkg_resources import resource_string
 
 import numpy as np
 import rasterio
-from rasterio.path import parse_path
+from rasterio.windows import Window
 
 from pylandsat import preprocessing
 
 
 BANDS = json.loads(resource_string(__name__, 'bands.json'))
 
+# Band numbers indexed by file suffix (B6_VCID_1 = 61 & B6_VCID_2 = 62)
+_SUFFIX_TO_BNUM = {
+    suffix: int(suffix[1] + suffix[-1]) if 'VCID' in suffix else int(suffix[1:])
+    for bands in BANDS.values() for suffix in bands
+}
+
+# Match string representations of integers and floats
+_INT_RE = re.compile(r'^[-+]?\d+$')
+_FLOAT_RE = re.compile(r'^[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?$')
+
+# Match the file suffix following the seven parts of the product ID
+_SUFFIX_RE = re.compile(r'(?:[A-Z0-9]+_){7}(\w+)\.(?:TIF|txt)$')
+
 
 def _to_numeric(value):
     """Try to convert a string to an integer or a float.
     If not possible, returns the initial string.
     """
-    try:
-        value  = int(value)
-    except:
-        try:
-            value = float(value)
-        except:
-            pass
+    if _INT_RE.match(value):
+        return int(value)
+    if _FLOAT_RE.match(value):
+        return float(value)
     return value
 
 
 def _suffix_from_fname(file_name):
     """Get file suffix from file name."""
-    if os.path.sep in file_name:
-        file_name = os.path.basename(file_name)
-    return file_name[41:].split('.')[0]
+    match = _SUFFIX_RE.search(file_name)
+    return match.group(1) if match else ''
 
 
 def _suffix_from_bnum(band_number):
@@ -57,29 +68,27 @@ def _suffix_from_name(band_name, sensor):
     """Get file suffix from band name (either long or short)."""
     if sensor not in BANDS:
         raise ValueError('Sensor %s not found.' % sensor)
-    for suffix, long_name in BANDS[sensor].items():
-        if band_name in (long_name, _band_shortname(long_name)):
-            return suffix
-    raise ValueError('Band %s not found.' % band_name)
+    try:
+        return _NAME_TO_SUFFIX[sensor][band_name]
+    except KeyError:
+        raise ValueError('Band %s not found.' % band_name)
 
 
 def _is_band(suffix):
     """Determine if a file suffix refers to a band."""
-    return suffix[0] == 'B' and suffix[1].isnumeric()
+    return suffix in _SUFFIX_TO_BNUM
 
 
 def _band_number(suffix):
     """Get band number from file suffix."""
-    if _is_band(suffix):
-        bnum_str = suffix[1:]
-        # B6_VCID_1 = 61 & B6_VCID_2 = 62
-        if 'VCID' in bnum_str:
-            bnum = int(bnum_str[0] + bnum_str[-1])
-        else:
-            bnum = int(bnum_str)
-    else:
+    try:
+        return _SUFFIX_TO_BNUM[suffix]
+    except KeyError:
         raise ValueError('The provided suffix does not refer to a band.')
-    return bnum
+
+
+# Characters replaced by underscores in short band names
+_SHORTNAME_TABLE = str.maketrans({' ': '_', '-': '_'})
 
 
 def _band_shortname(long_name):
@@ -91,15 +100,36 @@ def _band_shortname(long_name):
         end = long_name.find(')')
         short_name = long_name[start:end]
     else:
-        short_name = long_name.replace(' ', '_').replace('-', '_')
+        short_name = long_name.translate(_SHORTNAME_TABLE)
     return short_name.lower()
 
 
+# Short band names indexed by sensor and file suffix
+_SHORT_NAMES = {
+    sensor: {suffix: _band_shortname(long_name)
+             for suffix, long_name in bands.items()}
+    for sensor, bands in BANDS.items()
+}
+
+# File suffixes indexed by sensor and band name (either long or short)
+_NAME_TO_SUFFIX = {
+    sensor: {
+        **{long_name: suffix for suffix, long_name in BANDS[sensor].items()},
+        **{short_name: suffix for suffix, short_name in short_names.items()},
+    }
+    for sensor, short_names in _SHORT_NAMES.items()
+}
+
+
 class Scene:
     def __init__(self, scene_dir):
         """Landsat Level-1 scene."""
         self.dir = os.path.abspath(scene_dir)
+        self._scan()
         self.mtl = self._parse_mtl()
+        # Unknown sensors only prevent access to the bands
+        self._band_names = BANDS.get(self.sensor, {})
+        self._short_names = _SHORT_NAMES.get(self.sensor, {})
 
     def __getattr__(self, name):
         """Returns a Band object if possible."""
@@ -110,32 +140,81 @@ class Scene:
     def __iter__(self):
         """Iterate over bands."""
         available = self.available_bands()
-        for suffix, long_name in BANDS[self.sensor].items():
-            short_name = _band_shortname(long_name)
+        for suffix, short_name in self._short_names.items():
             if short_name in available:
                 yield Band(self, suffix)
 
+    def _scan(self):
+        """List scene files once and index them by suffix."""
+        with os.scandir(self.dir) as entries:
+            files = [entry for entry in entries
+                     if (entry.name.endswith('.TIF')
+                         or entry.name.endswith('.txt'))
+                     and entry.is_file()]
+        self._files = [entry.name for entry in files]
+        self._suffix_map = {_suffix_from_fname(entry.name): entry.path
+                            for entry in files}
+        self._bands = None
+
+    def clear_cache(self):
+        """Scan the scene directory again, e.g. after adding files."""
+        self._scan()
+
     def _available_files(self):
         """List available files in the scene directory."""
-        return [f for f in os.listdir(self.dir)
-                if f.endswith('.TIF') or f.endswith('.txt')]
+        return self._files
 
     def available_bands(self):
         """List short names of available bands."""
-        bands = []
-        for fname in self._available_files():
-            suffix = _suffix_from_fname(fname)
-            if _is_band(suffix):
-                long_name = BANDS[self.sensor][suffix]
-                bands.append(_band_shortname(long_name))
-        return bands
+        if self._bands is None:
+            short_names = self._short_names
+            self._bands = [short_names[suffix] for suffix in self._suffix_map
+                           if suffix in short_names]
+        return self._bands
 
     def file_path(self, suffix):
         """Find file path according to a given file suffix."""
-        for fname in self._available_files():
-            if suffix == _suffix_from_fname(fname):
-                return os.path.join(self.dir, fname)
-        raise ValueError('Suffix %s not available.' % suffix)
+        try:
+            return self._suffix_map[suffix]
+        except KeyError:
+            raise ValueError('Suffix %s not available.' % suffix)
+
+    def read_all(self, bands=None, max_workers=None):
+        """Read multiple bands concurrently into a single array.
+
+        Parameters
+        ----------
+        bands : list of str, optional
+            Short names of the bands to read. By default, all available
+            bands except the panchromatic one, whose resolution differs.
+        max_workers : int, optional
+            Number of bands read concurrently. Defaults to the number of
+            bands, up to 8. Local disks rarely benefit from more workers
+            than CPU cores, remote files from more than one per band.
+
+        Returns
+        -------
+        data : numpy.ndarray
+            DN values as a (bands, height, width) array.
+        """
+        if bands is None:
+            bands = [b for b in self.available_bands() if b != 'pan']
+        bands = [Band(self, _suffix_from_name(b, self.sensor)) for b in bands]
+        if not bands:
+            raise ValueError('No band to read.')
+        if not max_workers:
+            max_workers = min(8, len(bands))
+
+        def _read(band):
+            with band:
+                return band.read(1)
+
+        # rasterio releases the GIL while reading
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            arrays = list(executor.map(_read, bands))
+        if len({a.shape for a in arrays}) > 1:
+            raise ValueError('Bands do not share the same dimensions.')
+        return np.stack(arrays)
 
     def _parse_mtl(self):
         """Parse MTL metadata file.
@@ -147,20 +226,22 @@ class Scene:
         """
         mtl = {}
         fpath = self.file_path('MTL')
-        f = open(fpath)
-        for line in f.readlines():
-            if line.startswith('GROUP = L1_METADATA_FILE'):
-                pass  # ignore main group
-            elif line.strip().startswith('END'):
-                pass  # ignore end statements
-            elif line.strip().startswith('GROUP'):
-                group = line.split('=')[-1].strip()
-                mtl[group] = {}
-            else:
-                param, value = [s.strip() for s in line.split('=')]
-                value = value.replace('"', '')
-                value = _to_numeric(value)
-                mtl[group][param] = value
+        with open(fpath) as f:
+            for line in f:
+                param, sep, value = line.partition('=')
+                if not sep:  # ignore final END statement
+                    continue
+                param = param.strip()
+                value = value.strip()
+                if param == 'GROUP':
+                    if value != 'L1_METADATA_FILE':  # ignore main group
+                        group = mtl[value] = {}
+                elif param == 'END_GROUP':  # ignore end statements
+                    continue
+                elif value.startswith('"'):  # quoted values are strings
+                    group[param] = value.strip('"')
+                else:
+                    group[param] = _to_numeric(value)
         return mtl
 
     @property
@@ -196,7 +277,9 @@ class Scene:
     def date(self):
         """Acquisition date."""
         date_acquired = self.mtl['PRODUCT_METADATA']['DATE_ACQUIRED']
-        return datetime.strptime(date_acquired, '%Y-%m-%d')
+        # Fixed YYYY-MM-DD format
+        return datetime(int(date_acquired[:4]), int(date_acquired[5:7]),
+                        int(date_acquired[8:10]))
 
     @property
     def wrs_path(self):
@@ -214,90 +297,127 @@ class Scene:
         return Band(self, 'BQA')
 
 
-class Band(rasterio.io.DatasetReader):
+class Band:
+    """Landsat band. The underlying rasterio dataset is only opened when
+    first needed, and attributes not defined here (`read`, `profile`,
+    `transform`, etc.) are forwarded to it.
+    """
 
     def __init__(self, scene, suffix):
         self.scene = scene
         self.suffix = suffix
-        self.fname = '{pid}_{suffix}.TIF'.format(
-            pid=scene.product_id,
-            suffix=suffix
-        )
-        self.fpath = os.path.join(scene.dir, self.fname)
+        self.fpath = scene.file_path(suffix)
+        self.fname = os.path.basename(self.fpath)
         if suffix == 'BQA':
             self.long_name = 'Quality Band'
             self.bname = 'bqa'
             self.bnum = None
         else:
-            self.long_name = BANDS[self.scene.sensor][suffix]
-            self.bname = _band_shortname(self.long_name)
+            self.long_name = self.scene._band_names[suffix]
+            self.bname = self.scene._short_names[suffix]
             self.bnum = _band_number(self.suffix)
-        super().__init__(parse_path(self.fpath))
+        # Band identifier used in MTL keys, e.g. `4` or `6_VCID_1`
+        self._mtl_bnum = suffix[1:]
+        self._dataset = None
+
+    @property
+    def dataset(self):
+        """Underlying rasterio dataset, opened on first access."""
+        if self._dataset is None:
+            self._dataset = rasterio.open(self.fpath)
+        return self._dataset
+
+    def __getattr__(self, name):
+        """Forward unknown attributes to the rasterio dataset."""
+        if name.startswith('__') or name == '_dataset':
+            raise AttributeError(name)
+        return getattr(self.dataset, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Close the underlying dataset if it has been opened."""
+        if self._dataset is not None:
+            self._dataset.close()
+            self._dataset = None
 
     def _gain_bias(self, unit='radiance'):
         """Get band-specific radiometric rescaling factor.
         Returns a (gain, bias) tuple. Unit can be radiance or
         reflectance.
         """
-        if self.bnum == 61:
-            bnum = '6_VCID_1'
-        elif self.bnum == 62:
-            bnum = '6_VCID_2'
-        else:
-            bnum = str(self.bnum)
-        key_gain = unit.upper() + '_MULT_BAND_' + bnum
-        key_bias = unit.upper() + '_ADD_BAND_' + bnum
-        gain = self.scene.mtl['RADIOMETRIC_RESCALING'][key_gain]
-        bias = self.scene.mtl['RADIOMETRIC_RESCALING'][key_bias]
+        unit = unit.upper()
+        rescaling = self.scene.mtl['RADIOMETRIC_RESCALING']
+        gain = rescaling['{}_MULT_BAND_{}'.format(unit, self._mtl_bnum)]
+        bias = rescaling['{}_ADD_BAND_{}'.format(unit, self._mtl_bnum)]
         return gain, bias
 
     def _k1_k2(self):
         """Get band-specific thermal constants."""
-        if self.bnum == 61:
-            bnum = '6_VCID_1'
-        elif self.bnum == 62:
-            bnum = '6_VCID_2'
-        else:
-            bnum = str(self.bnum)
-        k1_key = 'K1_CONSTANT_BAND_' + bnum
-        k2_key = 'K2_CONSTANT_BAND_' + bnum
         if self.scene.spacecraft == 'LANDSAT_8':
-            k1 = self.scene.mtl['TIRS_THERMAL_CONSTANTS'][k1_key]
-            k2 = self.scene.mtl['TIRS_THERMAL_CONSTANTS'][k2_key]
+            constants = self.scene.mtl['TIRS_THERMAL_CONSTANTS']
         else:
-            k1 = self.scene.mtl['THERMAL_CONSTANTS'][k1_key]
-            k2 = self.scene.mtl['THERMAL_CONSTANTS'][k2_key]
+            constants = self.scene.mtl['THERMAL_CONSTANTS']
+        k1 = constants['K1_CONSTANT_BAND_' + self._mtl_bnum]
+        k2 = constants['K2_CONSTANT_BAND_' + self._mtl_bnum]
         return k1, k2
 
+    def _read_converted(self, convert, rows=512):
+        """Read DN values as float32 in strips of about `rows` rows
+        (a multiple of the block height) and apply a conversion function
+        to each strip. Returns a float32 array.
+        """
+        out = np.empty((self.height, self.width), dtype=np.float32)
+        block_height = self.block_shapes[0][0]
+        step = max(1, rows // block_height) * block_height
+        for row_off in range(0, self.height, step):
+            height = min(step, self.height - row_off)
+            window = Window(0, row_off, self.width, height)
+            strip = self.read(1, window=window, out_dtype=np.float32)
+            out[row_off:row_off + height] = convert(strip)
+        return out
+
     def to_radiance(self, custom_dn=None):
         """Convert DN values to TOA spectral radiance."""
-        if isinstance(custom_dn, np.ndarray):
-            dn = custom_dn
-        else:
-            dn = self.read(1)
         gain, bias = self._gain_bias(unit='radiance')
-        return preprocessing.to_radiance(dn, gain, bias)
+
+        def _convert(dn):
+            return preprocessing.to_radiance(dn, gain, bias)
+
+        if isinstance(custom_dn, np.ndarray):
+            return _convert(custom_dn)
+        return self._read_converted(_convert)
 
     def to_reflectance(self, custom_dn=None):
         """Convert DN values to TOA spectral reflectance."""
         if 'tir' in self.bname:
             raise ValueError('TIR bands cannot be converted to reflectance.')
-        if isinstance(custom_dn, np.ndarray):
-            dn = custom_dn
-        else:
-            dn = self.read(1)
         gain, bias = self._gain_bias(unit='reflectance')
-        return preprocessing.to_reflectance(dn, gain, bias)
+
+        def _convert(dn):
+            return preprocessing.to_reflectance(dn, gain, bias)
+
+        if isinstance(custom_dn, np.ndarray):
+            return _convert(custom_dn)
+        return self._read_converted(_convert)
 
     def to_brightness_temperature(self, custom_dn=None):
         """Convert DN values to brightness temperature."""
         if not 'tir' in self.bname:
             raise ValueError('Only thermal bands can be converted '
                              'to brightness temperature.')
-        if isinstance(custom_dn, np.ndarray):
-            dn = custom_dn
-        else:
-            dn = self.read(1)
-        radiance = self.to_radiance(custom_dn=dn)
+        gain, bias = self._gain_bias(unit='radiance')
         k1, k2 = self._k1_k2()
-        return preprocessing.to_brightness_temperature(radiance, k1, k2)
+
+        # DN to radiance and radiance to BT are fused for each block
+        def _convert(dn):
+            radiance = preprocessing.to_radiance(dn, gain, bias)
+            return preprocessing.to_brightness_temperature(radiance, k1, k2)
+
+        if isinstance(custom_dn, np.ndarray):
+            return _convert(custom_dn)
+        return self._read_converted(_convert)
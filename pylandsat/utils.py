@@ -1,13 +1,19 @@
 import gzip
 import os
 import hashlib
+import shutil
 from datetime import datetime
 
 import rasterio
 import requests
+from requests.adapters import HTTPAdapter
 from tqdm import tqdm
 
 
+# Size of the blocks written to disk when downloading a file
+CHUNK_SIZE = 8 * 1024 * 1024
+
+
 def bounds_from_transform(transform, width, height):
     """Calculate raster bounds from transform, width & height."""
     xres, yres = transform.a, transform.e
@@ -17,6 +23,12 @@ def bounds_from_transform(transform, width, height):
     return rasterio.coords.BoundingBox(left, bottom, right, top)
 
 
+def _date_from_yyyymmdd(datestring):
+    """Convert a YYYYMMDD string to a datetime object."""
+    return datetime(
+        int(datestring[:4]), int(datestring[4:6]), int(datestring[6:8]))
+
+
 def meta_from_pid(product_id):
     """Extract metadata contained in a Landsat Product Identifier."""
     meta = {}
@@ -24,8 +36,8 @@ def meta_from_pid(product_id):
     meta['product_id'] = product_id
     meta['sensor'], meta['correction'] = parts[0], parts[1]
     meta['path'], meta['row'] = int(parts[2][:3]), int(parts[2][3:])
-    meta['acquisition_date'] = datetime.strptime(parts[3], '%Y%m%d')
-    meta['processing_date'] = datetime.strptime(parts[4], '%Y%m%d')
+    meta['acquisition_date'] = _date_from_yyyymmdd(parts[3])
+    meta['processing_date'] = _date_from_yyyymmdd(parts[4])
     meta['collection'], meta['tier'] = int(parts[5]), parts[6]
     return meta
 
@@ -33,7 +45,12 @@ def meta_from_pid(product_id):
 def compute_md5(fpath):
     """Get hexadecimal MD5 hash of a file."""
     with open(fpath, 'rb') as f:
-        h = hashlib.md5(f.read())
+        if hasattr(hashlib, 'file_digest'):  # python >= 3.11
+            h = hashlib.file_digest(f, 'md5')
+        else:
+            h = hashlib.md5()
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                h.update(block)
     return h.hexdigest()
 
 
@@ -50,7 +67,23 @@ def _size(headers):
     return int(length)
 
 
-def download_file(url, outdir, progressbar=False, verify=False):
+def create_session(pool_size=16):
+    """Create a HTTP session whose connection pool can keep up to
+    `pool_size` connections alive per host.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+# HTTP session shared by default between all downloads
+SESSION = create_session(pool_size=16)
+
+
+def download_file(url, outdir, progressbar=False, verify=False,
+                  session=None, callback=None):
     """Download a file from an URL into a given directory.
 
     Parameters
@@ -63,6 +96,12 @@ def download_file(url, outdir, progressbar=False, verify=False):
         Display a progress bar.
     verify : bool, optional
         Check that remote and local MD5 haches are equal.
+    session : requests.Session, optional
+        HTTP session used to reuse connections across downloads. A
+        module-level session is used by default.
+    callback : callable, optional
+        Function called with the number of bytes written after each chunk,
+        e.g. to track the progress of several downloads at once.
     
     Returns
     -------
@@ -71,24 +110,42 @@ def download_file(url, outdir, progressbar=False, verify=False):
     """
     fname = url.split('/')[-1]
     fpath = os.path.join(outdir, fname)
-    r = requests.get(url, stream=True)
-    remotesize = int(r.headers.get('Content-Length', 0))
-    etag = r.headers.get('ETag', '').replace('"', '')
-
+    session = session or SESSION
+    try:
+        localsize = os.stat(fpath).st_size
+    except FileNotFoundError:
+        localsize = None
+
+    # Only request headers if the file may already have been downloaded
+    if localsize is not None:
+        r = session.head(url, allow_redirects=True)
+        if r.status_code != 200:
+            raise requests.exceptions.HTTPError(str(r.status_code))
+        if localsize == _size(r.headers):
+            return fpath
+
+    r = session.get(url, stream=True)
     if r.status_code != 200:
+        r.close()
         raise requests.exceptions.HTTPError(str(r.status_code))
+    remotesize = _size(r.headers)
+    etag = r.headers.get('ETag', '').replace('"', '')
 
-    if os.path.isfile(fpath) and os.path.getsize(fpath) == remotesize:
-        return fpath
     if progressbar:
         progress = tqdm(total=remotesize, unit='B', unit_scale=True)
         progress.set_description(fname)
+    # Read the raw stream in large blocks to limit per-chunk overhead
+    r.raw.decode_content = True
     with open(fpath, 'wb') as f:
-        for chunk in r.iter_content(chunk_size=1024 * 1024):
-            if chunk:
+        if progressbar or callback:
+            for chunk in iter(lambda: r.raw.read(CHUNK_SIZE), b''):
                 f.write(chunk)
                 if progressbar:
-                    progress.update(1024 * 1024)
+                    progress.update(len(chunk))
+                if callback:
+                    callback(len(chunk))
+        else:
+            shutil.copyfileobj(r.raw, f, CHUNK_SIZE)
 
     r.close()
     if progressbar:
@@ -106,8 +163,7 @@ def decompress(fpath, remove_archive=False):
     basedir, fname = os.path.dirname(fpath), os.path.basename(fpath)
     outpath = os.path.join(basedir, fname.replace('.gz', ''))
     with gzip.open(fpath, 'rb') as src, open(outpath, 'wb') as dst:
-        for line in src:
-            dst.write(line)
+        shutil.copyfileobj(src, dst, 1024 * 1024)
     if remove_archive:
         os.remove(fpath)
     return outpath
@@ -0,0 +1,32 @@
+"""Tests for catalog module."""
+
+from shapely.geometry import box
+
+from pylandsat import catalog
+
+
+def test__to_wkt():
+    assert catalog._to_wkt(box(0, 0, 1, 1)).startswith("POLYGON ((1.00000000")
+
+
+def test__coverage():
+    geom = box(0, 0, 2, 2)
+    footprints = [box(1, 1, 3, 3), box(-1, -1, 5, 5)]
+    assert catalog._coverage(geom, footprints) == [0.25, 1.0]
+
+
+class MockDB:
+    """Return a single WRS2 footprint whatever the query."""
+
+    def query(self, query, params=None):
+        footprint = box(1, 1, 3, 3)
+        return iter([{"path": 1, "row": 2, "geom": footprint.wkt,
+                      "geom_wkb": footprint.wkb}])
+
+
+def test_catalog_wrs():
+    cat = catalog.Catalog()
+    cat.db = MockDB()
+    path_row = cat.wrs(box(0, 0, 2, 2))
+    assert path_row == [{"path": 1, "row": 2, "geom": box(1, 1, 3, 3).wkt,
+                         "cover": 0.25}]
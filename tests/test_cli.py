@@ -0,0 +1,9 @@
+"""Tests for cli module."""
+
+from pylandsat import cli
+
+
+def test__split_csv_arg():
+    assert cli._split_csv_arg("T1") == ("T1", )
+    assert cli._split_csv_arg("LC08, LE07 ,LT05") == ("LC08", "LE07", "LT05")
+    assert cli._split_csv_arg("T1,, ,T2,") == ("T1", "T2")
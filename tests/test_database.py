@@ -0,0 +1,66 @@
+"""Tests for database module."""
+
+from datetime import datetime
+import sqlite3
+
+import pytest
+
+from pylandsat import database
+
+
+def test__flatten():
+    assert database._flatten([1, [2, 3], "a"]) == [1, 2, 3, "a"]
+    assert database._flatten([]) == []
+
+
+def test__format_placeholders():
+    QUERY = "SELECT * FROM t WHERE a IN ? AND b = ? AND c IN ?"
+    query, params = database._format_placeholders(QUERY, ([1, 2], 3, ["x"]))
+    assert query == "SELECT * FROM t WHERE a IN (?,?) AND b = ? AND c IN (?)"
+    assert params == [1, 2, 3, "x"]
+
+
+def test__parse_datestring():
+    expected = int(datetime(2020, 7, 12, 10, 3, 12).timestamp())
+    assert database._parse_datestring("2020-07-12T10:03:12.0550000Z") == expected
+    assert database._parse_datestring("2020-07-12T10:03:12Z") == expected
+
+
+def test__format_placeholders_tuple():
+    query, params = database._format_placeholders("a IN ? AND b = ?", (("x", "y"), 1))
+    assert query == "a IN (?,?) AND b = ?"
+    assert params == ["x", "y", 1]
+
+
+def test__parse_row():
+    ROW = ["LC81930272020194LGN00", "LC08_L1TP_193027_20200712_20200722_01_T1",
+           "LANDSAT_8", "OLI_TIRS", "2020-07-12", "01", "T1",
+           "2020-07-12T10:03:12.0550000Z", "L1TP", "193", "27", "3.0"]
+    assert database._parse_row(ROW) == (
+        "LC08_L1TP_193027_20200712_20200722_01_T1", "LC81930272020194LGN00",
+        193, 27, int(datetime(2020, 7, 12, 10, 3, 12).timestamp()), 3.0)
+
+
+def _catalog_row(product_id, path="193"):
+    return ["LC81930272020194LGN00", product_id, "LANDSAT_8", "OLI_TIRS",
+            "2020-07-12", "01", "T1", "2020-07-12T10:03:12.0550000Z", "L1TP",
+            path, "27", "3.0"]
+
+
+def test__load_catalog_duplicates():
+    conn = sqlite3.connect(":memory:")
+    rows = [_catalog_row("A"), _catalog_row("B"), _catalog_row("A", "194")]
+    database._load_catalog(conn, rows)
+    assert conn.execute(
+        "SELECT product_id, path FROM catalog ORDER BY product_id"
+    ).fetchall() == [("A", 193), ("B", 193)]
+    with pytest.raises(sqlite3.IntegrityError):
+        conn.execute("INSERT INTO catalog (product_id) VALUES ('A')")
+
+
+def test__load_catalog_rollback():
+    conn = sqlite3.connect(":memory:")
+    database._load_catalog(conn, [_catalog_row("A"), _catalog_row("B")])
+    with pytest.raises(ValueError):
+        database._load_catalog(conn, [_catalog_row("C"), _catalog_row("D", "x")])
+    assert conn.execute("SELECT COUNT(*) FROM catalog").fetchone() == (2, )
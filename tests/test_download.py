@@ -1,18 +1,36 @@
+import io
 import os
-import requests
 from tempfile import TemporaryDirectory
 
 from pylandsat.download import Product
 
 
-def test_download_lc05(monkeypatch):
-    PID = "LT05_L1TP_195051_19950807_20170107_01_T1"
-    product = Product(PID)
+class MockResponse:
+    """HTTP response with an empty body."""
+
+    status_code = 200
+    headers = {}
+
+    def __init__(self):
+        self.raw = io.BytesIO()
+
+    def close(self):
+        pass
+
+
+class MockSession:
+    """HTTP session that never reaches the network."""
+
+    def get(self, url, **kwargs):
+        return MockResponse()
 
-    def mockreturn(self, chunk_size):
-        return [b"", b"", b""]
+    def head(self, url, **kwargs):
+        return MockResponse()
 
-    monkeypatch.setattr(requests.Response, "iter_content", mockreturn)
+
+def test_download_lc05():
+    PID = "LT05_L1TP_195051_19950807_20170107_01_T1"
+    product = Product(PID, session=MockSession())
 
     with TemporaryDirectory() as tmpdir:
         product.download(tmpdir, progressbar=False, verify=False)
@@ -23,14 +41,9 @@ def test_download_lc05(monkeypatch):
         assert f"{PID}_MTL.txt" in contents
 
 
-def test_download_le07(monkeypatch):
+def test_download_le07():
     PID = "LE07_L1TP_205050_19991104_20170216_01_T1"
-    product = Product(PID)
-
-    def mockreturn(self, chunk_size):
-        return [b"", b"", b""]
-
-    monkeypatch.setattr(requests.Response, "iter_content", mockreturn)
+    product = Product(PID, session=MockSession())
 
     with TemporaryDirectory() as tmpdir:
         product.download(tmpdir, progressbar=False, verify=False)
@@ -42,14 +55,9 @@ def test_download_le07(monkeypatch):
         assert f"{PID}_MTL.txt" in contents
 
 
-def test_download_lc08(monkeypatch):
+def test_download_lc08():
     PID = "LC08_L1TP_193027_20200712_20200722_01_T1"
-    product = Product(PID)
-
-    def mockreturn(self, chunk_size):
-        return [b"", b"", b""]
-
-    monkeypatch.setattr(requests.Response, "iter_content", mockreturn)
+    product = Product(PID, session=MockSession())
 
     with TemporaryDirectory() as tmpdir:
         product.download(tmpdir, progressbar=False, verify=False)
@@ -0,0 +1,19 @@
+"""Tests for preprocessing module."""
+
+import numpy as np
+
+from pylandsat import preprocessing
+
+
+def test_to_radiance():
+    dn = np.array([[1, 2], [3, 4]], dtype=np.uint8)
+    radiance = preprocessing.to_radiance(dn, 0.5, -1)
+    assert radiance.dtype == np.float32
+    assert np.allclose(radiance, [[-0.5, 0], [0.5, 1]])
+
+
+def test_to_reflectance():
+    dn = np.array([[1, 2], [3, 4]], dtype=np.uint8)
+    reflectance = preprocessing.to_reflectance(dn, 0.2, 0.1, sun_elevation_angle=30)
+    assert reflectance.dtype == np.float32
+    assert np.allclose(reflectance, (0.2 * dn + 0.1) / 0.5)
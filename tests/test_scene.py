@@ -1,11 +1,14 @@
 """Tests for scene module."""
 
 from datetime import datetime
+import os
 from pkg_resources import resource_filename
 
+import numpy as np
 import pytest
+import rasterio
 
-from pylandsat import scene
+from pylandsat import preprocessing, scene
 
 
 def test__to_numeric():
@@ -17,6 +20,8 @@ def test__to_numeric():
 def test__suffix_from_fname():
     FNAME = "LC08_L1GT_044034_20130330_20170310_01_T2_B4.TIF"
     assert scene._suffix_from_fname(FNAME) == "B4"
+    FNAME = "/data/LT05_L1GS_030025_19860927_20161003_01_T2_B6_VCID_1.TIF"
+    assert scene._suffix_from_fname(FNAME) == "B6_VCID_1"
 
 
 def test__suffix_from_name():
@@ -28,6 +33,7 @@ def test__is_band():
     assert scene._is_band("B1")
     assert scene._is_band("B6_VCID_1")
     assert not scene._is_band("C1")
+    assert not scene._is_band("B")
 
 
 def test__band_number():
@@ -60,6 +66,9 @@ def test_scene_file_path(sample_scene):
 def test_scene__parse_mtl(sample_scene):
     mtl = sample_scene._parse_mtl()
     assert "PRODUCT_METADATA" in mtl
+    assert mtl["METADATA_FILE_INFO"]["REQUEST_ID"] == "0501610034102_09143"
+    assert mtl["METADATA_FILE_INFO"]["COLLECTION_NUMBER"] == 1
+    assert mtl["IMAGE_ATTRIBUTES"]["SUN_ELEVATION"] == 33.83475462
 
 
 def test_scene_scene_id(sample_scene):
@@ -85,3 +94,115 @@ def test_scene_date(sample_scene):
 def test_scene_wrs(sample_scene):
     assert sample_scene.wrs_path == 30
     assert sample_scene.wrs_row == 25
+
+
+PRODUCT_ID = "LT05_L1GS_030025_19860927_20161003_01_T2"
+
+
+def _write_band(scene_dir, suffix, data, **kwargs):
+    fpath = os.path.join(scene_dir, "{}_{}.TIF".format(PRODUCT_ID, suffix))
+    height, width = data.shape
+    with rasterio.open(fpath, "w", driver="GTiff", width=width, height=height,
+                       count=1, dtype=data.dtype, crs="EPSG:32615",
+                       transform=rasterio.Affine(30, 0, 0, 0, -30, 0),
+                       **kwargs) as dst:
+        dst.write(data, 1)
+
+
+def _copy_mtl(scene_dir, sensor="TM"):
+    sample_dir = resource_filename(
+        __name__, "data/LT05_01_030_025_" + PRODUCT_ID)
+    with open(os.path.join(sample_dir, PRODUCT_ID + "_MTL.txt")) as src:
+        mtl = src.read().replace('SENSOR_ID = "TM"',
+                                 'SENSOR_ID = "{}"'.format(sensor))
+    with open(os.path.join(scene_dir, PRODUCT_ID + "_MTL.txt"), "w") as dst:
+        dst.write(mtl)
+
+
+def _make_scene(tmp_path, sensor, bands):
+    """Write a scene whose bands, given as a {suffix: shape} dict, are
+    filled with their band number.
+    """
+    _copy_mtl(str(tmp_path), sensor=sensor)
+    for suffix, shape in bands.items():
+        data = np.full(shape, int(suffix[1:]), dtype="uint8")
+        _write_band(str(tmp_path), suffix, data)
+    return scene.Scene(str(tmp_path))
+
+
+@pytest.fixture
+def band_scene(tmp_path):
+    return _make_scene(tmp_path, "TM", {"B1": (12, 10), "B4": (12, 10)})
+
+
+def test_band_lazy_dataset(band_scene):
+    band = band_scene.blue
+    assert band.bname == "blue"
+    assert band.bnum == 1
+    assert band._dataset is None
+
+
+def test_band_forwarding(band_scene):
+    band = band_scene.nir
+    assert band.width == 10
+    assert band.profile["dtype"] == "uint8"
+    assert (band.read(1) == 4).all()
+    assert band._dataset is not None
+
+
+def test_band_close(band_scene):
+    with band_scene.blue as band:
+        band.read(1)
+        dataset = band.dataset
+    assert dataset.closed
+    assert band._dataset is None
+
+
+def test_scene_unknown_sensor(tmp_path):
+    oli_scene = _make_scene(tmp_path, "OLI", {"B1": (12, 10)})
+    assert oli_scene.date == datetime(1986, 9, 27)
+    assert oli_scene.available_bands() == []
+    with pytest.raises(AttributeError):
+        oli_scene.blue
+
+
+@pytest.fixture
+def etm_scene(tmp_path):
+    return _make_scene(
+        tmp_path, "ETM", {"B1": (12, 10), "B2": (12, 10), "B8": (24, 20)})
+
+
+def test_scene_read_all(etm_scene):
+    data = etm_scene.read_all()
+    assert data.shape == (2, 12, 10)
+    assert sorted(data[:, 0, 0]) == [1, 2]
+    data = etm_scene.read_all(["green", "blue"], max_workers=1)
+    assert data[:, 0, 0].tolist() == [2, 1]
+
+
+def test_scene_read_all_errors(etm_scene):
+    with pytest.raises(ValueError, match="No band to read"):
+        etm_scene.read_all([])
+    with pytest.raises(ValueError, match="same dimensions"):
+        etm_scene.read_all(["blue", "pan"])
+
+
+@pytest.mark.parametrize("tiled", [False, True])
+def test_band_converted_strips(tmp_path, tiled):
+    _copy_mtl(str(tmp_path))
+    data = np.random.default_rng(0).integers(1, 255, (1100, 300), "uint8")
+    kwargs = {"tiled": True, "blockxsize": 256, "blockysize": 256} \
+        if tiled else {}
+    _write_band(str(tmp_path), "B4", data, **kwargs)
+    _write_band(str(tmp_path), "B6", data, **kwargs)
+    sample = scene.Scene(str(tmp_path))
+
+    gain, bias = sample.nir._gain_bias(unit="reflectance")
+    expected = preprocessing.to_reflectance(data, gain, bias)
+    assert np.allclose(sample.nir.to_reflectance(), expected)
+
+    gain, bias = sample.tirs._gain_bias()
+    k1, k2 = sample.tirs._k1_k2()
+    radiance = preprocessing.to_radiance(data, gain, bias)
+    expected = preprocessing.to_brightness_temperature(radiance, k1, k2)
+    assert np.allclose(sample.tirs.to_brightness_temperature(), expected)